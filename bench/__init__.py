@@ -0,0 +1 @@
+"""ZStok lisans sunucusu kıyaslama betikleri"""
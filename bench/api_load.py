@@ -0,0 +1,437 @@
+"""Lisans API'si için yük testi ve kıyaslama betiği
+
+Geçici bir veritabanına (varsayılan SQLite, --database-uri ile PostgreSQL)
+sentetik müşteri, lisans, aktivasyon ve deneme kayıtları yükler, ardından
+gerçekçi istek karışımlarını uygulamaya süreç içinde (Flask test istemcisi)
+veya HTTP üzerinden (yerel Waitress ya da --url ile çalışan bir sunucu) uygular.
+Uç nokta başına p50/p95/p99 gecikme, saniyedeki istek ve istek başına sorgu
+sayısını raporlar; sonuçlar JSON olarak kaydedilir ve --compare ile önceki bir
+çalıştırmayla karşılaştırılır.
+
+Senaryolar:
+    heartbeat         Doğrulama ağırlıklı istemci trafiği (%90 validate, %10 trial/validate)
+    activation-storm  Yeni cihaz aktivasyonları ve deaktivasyonlar
+    trial             Deneme süreci uygunluk, başlatma ve doğrulama
+    admin-reports     Doğrulama trafiği altında admin rapor, liste ve dashboard istekleri
+
+Kullanım:
+    python -m bench.api_load --customers 10000 --requests 5000 --concurrency 16 --output api.json
+    python -m bench.api_load --mode http --scenario heartbeat --compare api.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ('heartbeat', 'activation-storm', 'trial', 'admin-reports')
+
+# Tek toplu eklemede en fazla satır
+SEED_CHUNK_SIZE = 5000
+
+def seed(license_server, customers, licenses_per_customer, activations_per_license, trials):
+    """Sentetik verileri toplu eklemelerle yükle, senaryoların kullanacağı anahtarları döndür"""
+    db = license_server.db
+    now = datetime.utcnow()
+
+    def insert(model, rows):
+        for index in range(0, len(rows), SEED_CHUNK_SIZE):
+            db.session.execute(db.insert(model), rows[index:index + SEED_CHUNK_SIZE])
+        db.session.commit()
+
+    with license_server.app.app_context():
+        insert(license_server.Customer, [
+            {
+                'id': customer_id,
+                'name': f'Müşteri {customer_id}',
+                'email': f'bench{customer_id}@example.com',
+                'created_at': now - timedelta(minutes=customer_id)
+            }
+            for customer_id in range(1, customers + 1)
+        ])
+
+        licenses = []
+        activations = []
+        license_id = 0
+        for customer_id in range(1, customers + 1):
+            for _ in range(licenses_per_customer):
+                license_id += 1
+                licenses.append({
+                    'id': license_id,
+                    'license_key': f'BENCH-{license_id:08d}',
+                    'customer_id': customer_id,
+                    'edition': random.choice(['standard', 'professional', 'enterprise']),
+                    'max_activations': activations_per_license + 1000,
+                    'expiry_date': now + timedelta(days=random.randint(-30, 365)),
+                    'is_active': random.random() > 0.05,
+                    'created_at': now - timedelta(minutes=license_id),
+                    'activation_date': now - timedelta(days=30)
+                })
+                for activation_index in range(activations_per_license):
+                    activations.append({
+                        'license_id': license_id,
+                        'hardware_id': f'HW-{license_id}-{activation_index}',
+                        'activation_date': now - timedelta(days=30),
+                        'last_check_date': now - timedelta(hours=1),
+                        'is_active': True,
+                        'is_trial': False
+                    })
+
+        for trial_index in range(trials):
+            hardware_id = f'TRIAL-{trial_index}'
+            started = now - timedelta(days=random.randint(0, 10))
+            activations.append({
+                'hardware_id': hardware_id,
+                'activation_date': started,
+                'last_check_date': started,
+                'is_active': True,
+                'is_trial': True,
+                'trial_start_date': started,
+                'trial_hardware_hash': license_server.generate_hardware_hash(hardware_id)
+            })
+
+        insert(license_server.License, licenses)
+        insert(license_server.Activation, activations)
+
+    return {
+        'activated': [
+            (row['license_key'], f"HW-{row['id']}-{index}", f"bench{row['customer_id']}@example.com")
+            for row in licenses
+            for index in range(activations_per_license)
+        ],
+        'licenses': [(row['license_key'], f"bench{row['customer_id']}@example.com") for row in licenses],
+        'trials': [f'TRIAL-{index}' for index in range(trials)]
+    }
+
+def build_request(scenario, data, sequence):
+    """Senaryoya göre bir (ad, yöntem, yol, gövde) isteği üret"""
+    if scenario == 'heartbeat':
+        if random.random() < 0.9:
+            license_key, hardware_id, _ = random.choice(data['activated'])
+            return 'validate', 'POST', '/api/v1/validate', {'license_key': license_key, 'hardware_id': hardware_id}
+        return 'trial_validate', 'POST', '/api/v1/trial/validate', {'hardware_id': random.choice(data['trials'])}
+
+    if scenario == 'activation-storm':
+        license_key, email = random.choice(data['licenses'])
+        hardware_id = f'STORM-{sequence}'
+        if random.random() < 0.8:
+            return 'activate', 'POST', '/api/v1/activate', {
+                'license_key': license_key,
+                'email': email,
+                'hardware_id': hardware_id,
+                'system_info': {'os': 'Windows 11', 'cpu_id': f'CPU-{sequence}'}
+            }
+        license_key, hardware_id, _ = random.choice(data['activated'])
+        return 'deactivate', 'POST', '/api/v1/deactivate', {'license_key': license_key, 'hardware_id': hardware_id}
+
+    if scenario == 'trial':
+        roll = random.random()
+        if roll < 0.3:
+            return 'trial_check', 'POST', '/api/v1/trial/check', {'hardware_id': f'NEWTRIAL-{sequence}'}
+        if roll < 0.5:
+            return 'trial_start', 'POST', '/api/v1/trial/start', {'hardware_id': f'NEWTRIAL-{sequence}'}
+        return 'trial_validate', 'POST', '/api/v1/trial/validate', {'hardware_id': random.choice(data['trials'])}
+
+    # admin-reports: doğrulama trafiği altında admin okumaları
+    roll = random.random()
+    if roll < 0.02:
+        return 'report_licenses', 'GET', '/api/admin/reports/licenses?format=ndjson', None
+    if roll < 0.05:
+        return 'dashboard', 'GET', '/api/admin/dashboard/stats', None
+    if roll < 0.10:
+        last_page = max(1, len(data['licenses']) // 50)
+        return 'list_licenses', 'GET', f'/api/admin/licenses/list?per_page=50&page={random.randint(1, last_page)}', None
+    license_key, hardware_id, _ = random.choice(data['activated'])
+    return 'validate', 'POST', '/api/v1/validate', {'license_key': license_key, 'hardware_id': hardware_id}
+
+class InProcessClient:
+    """Flask test istemcisiyle WSGI uygulamasını doğrudan çağırır (iş parçacığı başına bir istemci)"""
+
+    def __init__(self, app, token):
+        self.app = app
+        self.token = token
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        headers = {'Authorization': f'Bearer {self.token}'} if path.startswith('/api/admin') else {}
+        response = client.open(path, method=method, json=body, headers=headers)
+        response.get_data()
+        return response.status_code
+
+class HttpClient:
+    """Kalıcı HTTP bağlantılarıyla bir sunucuya istek gönderir (iş parçacığı başına bir bağlantı)"""
+
+    def __init__(self, base_url, token):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.token = token
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+        headers = {'Content-Type': 'application/json'}
+        if path.startswith('/api/admin'):
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body) if body is not None else None
+
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            # Bağlantı koptuysa bir sonraki istekte yeniden aç
+            connection.close()
+            self._local.connection = None
+            return 0
+
+class QueryCounter:
+    """Motor üzerinde çalıştırılan SQL ifadelerini sayar (arka plan yazmaları dahil)"""
+
+    def __init__(self, license_server):
+        self.count = 0
+        self._lock = threading.Lock()
+        with license_server.app.app_context():
+            license_server.db.event.listen(license_server.db.engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+def percentile(sorted_values, fraction):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik değer"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies):
+    """Gecikme listesinden (saniye) milisaniye cinsinden özet"""
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values) * 1000, 3) if values else None,
+        'p50_ms': round(percentile(values, 0.50) * 1000, 3) if values else None,
+        'p95_ms': round(percentile(values, 0.95) * 1000, 3) if values else None,
+        'p99_ms': round(percentile(values, 0.99) * 1000, 3) if values else None,
+        'max_ms': round(values[-1] * 1000, 3) if values else None
+    }
+
+def run_scenario(scenario, client, data, total_requests, concurrency, query_counter, flush):
+    """Senaryoyu eşzamanlı iş parçacıklarıyla çalıştır ve özetini döndür"""
+    latencies = {}
+    errors = {}
+    lock = threading.Lock()
+    sequence = iter(range(total_requests))
+
+    def worker():
+        while True:
+            with lock:
+                current = next(sequence, None)
+            if current is None:
+                return
+
+            name, method, path, body = build_request(scenario, data, current)
+            started = time.perf_counter()
+            status = client.request(method, path, body)
+            elapsed = time.perf_counter() - started
+
+            with lock:
+                latencies.setdefault(name, []).append(elapsed)
+                if status >= 500 or status == 0:
+                    errors[name] = errors.get(name, 0) + 1
+
+    queries_before = query_counter.count if query_counter else None
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+
+    # Arka plan yazmaları (son kontrol, denetim günlüğü) da isteklerin maliyetine dahil
+    if flush:
+        flush()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    result = {
+        'requests': len(all_latencies),
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(all_latencies) / elapsed, 1) if elapsed else None,
+        'errors': sum(errors.values()),
+        'queries_per_request': (
+            round((query_counter.count - queries_before) / len(all_latencies), 2)
+            if query_counter and all_latencies else None
+        ),
+        'latency': summarize(all_latencies),
+        'endpoints': {
+            name: dict(summarize(values), errors=errors.get(name, 0))
+            for name, values in sorted(latencies.items())
+        }
+    }
+    return result
+
+def start_local_server(app, threads):
+    """Uygulamayı rastgele bir yerel portta Waitress ile arka planda başlat"""
+    from waitress.server import create_server
+    server = create_server(app, host='127.0.0.1', port=0, threads=threads)
+    thread = threading.Thread(target=server.run, name='bench-waitress', daemon=True)
+    thread.start()
+    return server, f'http://127.0.0.1:{server.effective_port}'
+
+def admin_token(client):
+    """Varsayılan admin hesabıyla giriş yap ve JWT döndür"""
+    if isinstance(client, InProcessClient):
+        response = client.app.test_client().post('/api/admin/login', json={'username': 'admin', 'password': 'admin123'})
+        return response.get_json()['token']
+
+    connection = http.client.HTTPConnection(client.host, client.port, timeout=30)
+    connection.request('POST', '/api/admin/login', body=json.dumps({'username': 'admin', 'password': 'admin123'}),
+                       headers={'Content-Type': 'application/json'})
+    return json.loads(connection.getresponse().read())['token']
+
+def git_revision():
+    """Karşılaştırma için mevcut commit kimliği (yoksa None)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+def print_comparison(results, previous):
+    """Önceki çalıştırmaya göre req/s ve p95 değişimlerini yazdır"""
+    print(f"\n{'Karşılaştırma':<20} {'req/s önce':>11} {'req/s sonra':>12} {'p95 önce':>10} {'p95 sonra':>10}")
+    for scenario, result in results['scenarios'].items():
+        old = previous.get('scenarios', {}).get(scenario)
+        if not old:
+            continue
+        print(f"{scenario:<20} {old['requests_per_second']:>11} {result['requests_per_second']:>12} "
+              f"{old['latency']['p95_ms']:>10} {result['latency']['p95_ms']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Lisans API yük testi')
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Çalıştırılacak senaryo (tekrarlanabilir, varsayılan: hepsi)')
+    parser.add_argument('--mode', choices=['inprocess', 'http'], default='inprocess', help='İstekler süreç içinden mi HTTP ile mi gönderilsin')
+    parser.add_argument('--url', help='HTTP modunda hedef sunucu (verilmezse yerel Waitress başlatılır)')
+    parser.add_argument('--database-uri', help='Yüklenecek veritabanı (varsayılan: geçici SQLite)')
+    parser.add_argument('--customers', type=int, default=1000, help='Sentetik müşteri sayısı')
+    parser.add_argument('--licenses-per-customer', type=int, default=2, help='Müşteri başına lisans')
+    parser.add_argument('--activations-per-license', type=int, default=2, help='Lisans başına aktivasyon')
+    parser.add_argument('--trials', type=int, default=1000, help='Sentetik deneme süreci sayısı')
+    parser.add_argument('--requests', type=int, default=2000, help='Senaryo başına istek sayısı')
+    parser.add_argument('--concurrency', type=int, default=8, help='Eşzamanlı istemci iş parçacığı')
+    parser.add_argument('--server-threads', type=int, default=8, help='Yerel Waitress iş parçacığı sayısı')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--verbose', action='store_true', help='Sunucu INFO loglarını göster')
+    parser.add_argument('--rate-limits', action='store_true', help='İstemci API hız sınırlarını açık bırak (varsayılan: kapalı)')
+    args = parser.parse_args()
+
+    scenarios = args.scenario or list(SCENARIOS)
+
+    if args.database_uri:
+        database_uri = args.database_uri
+    else:
+        workdir = tempfile.mkdtemp(prefix='zstok-bench-')
+        database_uri = f"sqlite:///{os.path.join(workdir, 'licenses.db')}"
+    os.environ['ZSTOK_DATABASE_URI'] = database_uri
+
+    import license_server
+    if not args.verbose:
+        # İstek başına INFO logları ölçümü bozmasın
+        license_server.logger.setLevel(logging.WARNING)
+
+    if not args.rate_limits:
+        # Tüm istekler tek adresten geldiği için sınırlar ölçümü 429 yanıtlarıyla doldurur
+        license_server.rate_limiter.enabled = False
+
+    license_server.init_db()
+
+    print(f'Sentetik veri yükleniyor ({database_uri})')
+    started = time.perf_counter()
+    data = seed(license_server, args.customers, args.licenses_per_customer, args.activations_per_license, args.trials)
+    print(f"Yükleme tamamlandı: {len(data['licenses'])} lisans, {len(data['activated'])} aktivasyon, "
+          f"{len(data['trials'])} deneme ({time.perf_counter() - started:.1f} sn)")
+
+    query_counter = None
+    if args.mode == 'http' and args.url:
+        # Harici sunucunun sorgu sayısı bu süreçten görülemez
+        client = HttpClient(args.url, None)
+    else:
+        query_counter = QueryCounter(license_server)
+        if args.mode == 'http':
+            # Sunucu daemon iş parçacığında çalışır, betik bitince süreçle birlikte kapanır
+            _, base_url = start_local_server(license_server.app, args.server_threads)
+            client = HttpClient(base_url, None)
+        else:
+            client = InProcessClient(license_server.app, None)
+    client.token = admin_token(client)
+
+    # Arka plan kuyruklarını senaryo sonunda boşalt (yalnızca süreç içi sunucu)
+    flush = None if args.url else license_server.flush_background_workers
+
+    results = {
+        'generated_at': datetime.utcnow().isoformat(),
+        'revision': git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': database_uri.split(':', 1)[0],
+            'signing': license_server.key_manager.tag(),
+            'mode': args.mode,
+            'target': args.url
+        },
+        'dataset': {
+            'customers': args.customers,
+            'licenses': len(data['licenses']),
+            'activations': len(data['activated']),
+            'trials': len(data['trials'])
+        },
+        'scenarios': {}
+    }
+
+    print(f"\n{'Senaryo':<20} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sorgu/istek':>12} {'hata':>6}")
+    for scenario in scenarios:
+        result = run_scenario(scenario, client, data, args.requests, args.concurrency, query_counter, flush)
+        results['scenarios'][scenario] = result
+        latency = result['latency']
+        print(f"{scenario:<20} {result['requests_per_second']:>9} {latency['p50_ms']:>9} {latency['p95_ms']:>9} "
+              f"{latency['p99_ms']:>9} {str(result['queries_per_request']):>12} {result['errors']:>6}")
+        for name, endpoint in result['endpoints'].items():
+            print(f"  {name:<18} {'':>9} {endpoint['p50_ms']:>9} {endpoint['p95_ms']:>9} {endpoint['p99_ms']:>9} "
+                  f"{'':>12} {endpoint['errors']:>6}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f'\nSonuçlar kaydedildi: {args.output}')
+
+if __name__ == '__main__':
+    main()
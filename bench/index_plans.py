@@ -0,0 +1,223 @@
+"""Bileşik indeks göçünün etkisini ölçen kıyaslama betiği
+
+Geçici bir SQLite veritabanına sentetik veri (varsayılan 1M aktivasyon) yükler,
+sık kullanılan sorguların planlarını ve gecikmelerini --migrate öncesi (hiçbir
+göç uygulanmamış, sürüm 0 şeması) ve sonrası için raporlar.
+
+Kullanım:
+    python -m bench.index_plans --activations 1000000 --output index_plans.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sorgu kalıpları: (ad, SQL, parametre üreteci)
+QUERY_SHAPES = [
+    (
+        'activation_by_license_hardware',
+        'SELECT id FROM activation WHERE license_id = ? AND hardware_id = ? AND is_active = 1 LIMIT 1',
+        lambda data: (random.randint(1, data['licenses']), f"HW-{random.randint(1, data['activations'])}")
+    ),
+    (
+        'trial_by_hardware_hash',
+        'SELECT id FROM activation WHERE trial_hardware_hash = ? AND is_trial = 1 AND is_active = 1 LIMIT 1',
+        lambda data: (f"{random.randint(1, data['activations']):064x}",)
+    ),
+    (
+        'failed_logins_in_window',
+        'SELECT count(*) FROM failed_login_attempt WHERE username = ? AND ip_address = ? AND attempt_time >= ?',
+        lambda data: (f"user{random.randint(1, 500)}", f"10.0.{random.randint(0, 9)}.{random.randint(1, 250)}",
+                      (data['now'] - timedelta(minutes=30)).isoformat(sep=' '))
+    ),
+    (
+        'licenses_expiring_soon',
+        'SELECT count(*) FROM license WHERE expiry_date > ? AND expiry_date < ? AND is_active = 1',
+        lambda data: (data['now'].isoformat(sep=' '), (data['now'] + timedelta(days=30)).isoformat(sep=' '))
+    ),
+    (
+        'license_list_first_page',
+        'SELECT id FROM license ORDER BY created_at DESC, id DESC LIMIT 20',
+        lambda data: ()
+    )
+]
+
+NEW_INDEXES = [
+    'ix_activation_license_hardware_active',
+    'ix_activation_trial_hash',
+    'ix_failed_login_user_ip_time',
+    'ix_license_expiry_active',
+    'ix_license_created_at',
+    'ix_license_customer_active',
+    'ix_customer_created_at'
+]
+
+# Sonraki göçlerin eklediği indeksler; ölçüm öncesinde bunlar da kaldırılmazsa
+# ör. trial_by_hardware_hash "önce" durumunda da ux_activation_trial_hash ile çalışır
+LATER_MIGRATION_INDEXES = [
+    'ux_activation_trial_hash',
+    'ix_license_expired',
+    'ix_activation_trial_active'
+]
+
+def downgrade_to_unmigrated(path):
+    """init_db ile oluşan güncel şemayı hiçbir göç uygulanmamış (sürüm 0) şemaya indir"""
+    connection = sqlite3.connect(path)
+    for index_name in NEW_INDEXES + LATER_MIGRATION_INDEXES:
+        connection.execute(f'DROP INDEX IF EXISTS {index_name}')
+    # migration_002 tabloyu, migration_004 sütunu ekler
+    connection.execute('DROP TABLE IF EXISTS revocation_entry')
+    connection.execute('ALTER TABLE license DROP COLUMN is_expired')
+    connection.execute("UPDATE server_state SET value = '0' WHERE key = 'schema_version'")
+    connection.commit()
+    
+    indexes = sorted(row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name NOT LIKE 'sqlite_autoindex_%'"
+    ))
+    connection.close()
+    return indexes
+
+def seed(path, activations, licenses, failed_logins):
+    """Sentetik veriyi doğrudan sqlite3 ile hızlıca yükle"""
+    now = datetime.utcnow()
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=OFF')
+    
+    customers = max(1, licenses // 3)
+    connection.executemany(
+        'INSERT INTO customer (id, name, email, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+        ((i, f'Müşteri {i}', f'customer{i}@example.com', now - timedelta(minutes=i), now) for i in range(1, customers + 1))
+    )
+    connection.executemany(
+        'INSERT INTO license (id, license_key, customer_id, expiry_date, edition, features, max_activations, '
+        'is_active, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        ((i, f'ZS-{i:016d}', random.randint(1, customers), now + timedelta(days=random.randint(-200, 400)),
+          random.choice(['standard', 'professional', 'enterprise']), '[]', 5, random.random() > 0.1,
+          now - timedelta(minutes=i), now) for i in range(1, licenses + 1))
+    )
+    
+    def activation_rows():
+        for i in range(1, activations + 1):
+            is_trial = i % 5 == 0
+            yield (
+                i,
+                None if is_trial else random.randint(1, licenses),
+                f'HW-{i}',
+                now - timedelta(minutes=i),
+                now,
+                random.random() > 0.2,
+                is_trial,
+                now - timedelta(days=random.randint(0, 30)) if is_trial else None,
+                f'{i:064x}' if is_trial else None
+            )
+    
+    connection.executemany(
+        'INSERT INTO activation (id, license_id, hardware_id, activation_date, last_check_date, is_active, '
+        'is_trial, trial_start_date, trial_hardware_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        activation_rows()
+    )
+    connection.executemany(
+        'INSERT INTO failed_login_attempt (username, ip_address, attempt_time) VALUES (?, ?, ?)',
+        ((f'user{random.randint(1, 500)}', f'10.0.{random.randint(0, 9)}.{random.randint(1, 250)}',
+          now - timedelta(minutes=random.randint(0, 60 * 24 * 30))) for _ in range(failed_logins))
+    )
+    connection.commit()
+    connection.close()
+
+def measure(path, data, repeats):
+    """Her sorgu kalıbı için planı ve gecikme dağılımını ölç"""
+    connection = sqlite3.connect(path)
+    connection.execute('ANALYZE')
+    results = {}
+    
+    for name, sql, make_params in QUERY_SHAPES:
+        params = make_params(data)
+        plan = [row[3] for row in connection.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+        
+        timings = []
+        for _ in range(repeats):
+            params = make_params(data)
+            started = time.perf_counter()
+            connection.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        
+        timings.sort()
+        results[name] = {
+            'plan': plan,
+            'p50_ms': round(statistics.median(timings), 4),
+            'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 4),
+            'max_ms': round(timings[-1], 4)
+        }
+    
+    connection.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Bileşik indeks göçü kıyaslaması')
+    parser.add_argument('--activations', type=int, default=1000000, help='Sentetik aktivasyon sayısı')
+    parser.add_argument('--licenses', type=int, default=200000, help='Sentetik lisans sayısı')
+    parser.add_argument('--failed-logins', type=int, default=200000, help='Sentetik başarısız giriş sayısı')
+    parser.add_argument('--repeats', type=int, default=50, help='Her sorgu için tekrar sayısı')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix='zstok-bench-')
+    path = os.path.join(workdir, 'licenses.db')
+    os.environ['ZSTOK_DATABASE_URI'] = f'sqlite:///{path}'
+    
+    import license_server
+    
+    # Şemayı oluştur, ardından göç öncesi (eski) duruma getir
+    license_server.init_db()
+    indexes = downgrade_to_unmigrated(path)
+    print(f"Göç öncesi indeksler: {', '.join(indexes)}")
+    
+    print(f'Sentetik veri yükleniyor: {args.activations} aktivasyon, {args.licenses} lisans ({path})')
+    started = time.perf_counter()
+    seed(path, args.activations, args.licenses, args.failed_logins)
+    print(f'Yükleme tamamlandı: {time.perf_counter() - started:.1f} sn')
+    
+    data = {
+        'activations': args.activations,
+        'licenses': args.licenses,
+        'now': datetime.utcnow()
+    }
+    
+    before = measure(path, data, args.repeats)
+    
+    started = time.perf_counter()
+    license_server.run_migrations()
+    migration_seconds = time.perf_counter() - started
+    
+    after = measure(path, data, args.repeats)
+    
+    print(f'\nGöç süresi: {migration_seconds:.1f} sn\n')
+    print(f"{'Sorgu':<34} {'Önce p50 ms':>12} {'Sonra p50 ms':>13}  Plan (sonra)")
+    for name, _, _ in QUERY_SHAPES:
+        print(f"{name:<34} {before[name]['p50_ms']:>12} {after[name]['p50_ms']:>13}  {'; '.join(after[name]['plan'])}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'dataset': {
+                    'activations': args.activations,
+                    'licenses': args.licenses,
+                    'failed_logins': args.failed_logins
+                },
+                'migration_seconds': round(migration_seconds, 2),
+                'before': before,
+                'after': after
+            }, f, indent=2, ensure_ascii=False)
+        print(f'\nSonuçlar kaydedildi: {args.output}')
+
+if __name__ == '__main__':
+    main()
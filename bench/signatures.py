@@ -0,0 +1,69 @@
+"""İmza şemalarının (RS256, EdDSA, ES256) hızını karşılaştıran kıyaslama betiği
+
+Her şema için geçici bir anahtar çifti üretir ve aktivasyon yanıtındaki
+doğrulama dizesine benzer bir veriyle saniyedeki imzalama ve doğrulama
+sayısını ölçer. Sunucunun kullandığı imzalama fonksiyonları çağrılır.
+
+Kullanım:
+    python -m bench.signatures --seconds 2 --output signatures.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Aktivasyon yanıtındaki doğrulama dizesine benzer veri
+SAMPLE_DATA = b'ZS-AB12-CD34-EF56-GH78:42:HW-0123456789abcdef:2026-12-31T23:59:59'
+
+def run_for(seconds, operation):
+    """İşlemi verilen süre boyunca tekrarla, saniyedeki işlem sayısını döndür"""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        operation()
+        count += 1
+        if count % 16 == 0 and time.perf_counter() >= deadline:
+            break
+    return count / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description='İmza şeması kıyaslaması')
+    parser.add_argument('--seconds', type=float, default=2.0, help='Her ölçüm için süre (saniye)')
+    parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='zstok-bench-')
+    os.environ['ZSTOK_DATABASE_URI'] = f"sqlite:///{os.path.join(workdir, 'licenses.db')}"
+
+    from license_server import SIGNATURE_SCHEMES, generate_private_key, sign_with_key, verify_with_key
+
+    results = {}
+    for algorithm, scheme in SIGNATURE_SCHEMES.items():
+        private_key = generate_private_key(algorithm)
+        public_key = private_key.public_key()
+        signature = sign_with_key(algorithm, private_key, SAMPLE_DATA)
+        verify_with_key(algorithm, public_key, signature, SAMPLE_DATA)
+
+        results[scheme['tag']] = {
+            'algorithm': algorithm,
+            'signature_bytes': len(signature),
+            'signs_per_second': round(run_for(args.seconds, lambda: sign_with_key(algorithm, private_key, SAMPLE_DATA)), 1),
+            'verifies_per_second': round(run_for(args.seconds, lambda: verify_with_key(algorithm, public_key, signature, SAMPLE_DATA)), 1)
+        }
+
+    print(f"{'Şema':<8} {'İmza/sn':>12} {'Doğrulama/sn':>14} {'İmza bayt':>10}")
+    for tag, result in results.items():
+        print(f"{tag:<8} {result['signs_per_second']:>12} {result['verifies_per_second']:>14} {result['signature_bytes']:>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'seconds': args.seconds, 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f'\nSonuçlar kaydedildi: {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# license_server yüklenirken veritabanına bağlanır; geçici adres içe aktarmadan önce verilir
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='zstok-test-')
+os.environ['ZSTOK_DATABASE_URI'] = f"sqlite:///{os.path.join(TEST_DATA_DIR, 'licenses.db')}"
+os.environ.pop('ZSTOK_REPLICA_URI', None)
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+import license_server
+
+license_server.init_db()
+
+def run_server(database_uri, *args):
+    """Sunucuyu ayrı veritabanıyla komut satırından çalıştır (göç ve başlangıç denetimleri)"""
+    return subprocess.run(
+        [sys.executable, os.path.join(SERVER_DIR, 'license_server.py'), *args],
+        env=dict(os.environ, ZSTOK_DATABASE_URI=database_uri),
+        capture_output=True, text=True, timeout=120
+    )
+
+@pytest.fixture
+def server():
+    return license_server
+
+@pytest.fixture(autouse=True)
+def disable_rate_limits(monkeypatch):
+    """Tüm istekler aynı adresten gelir; hız sınırı testleri sınırlayıcıyı kendisi açar"""
+    monkeypatch.setattr(license_server.rate_limiter, 'enabled', False)
+
+@pytest.fixture
+def app_context():
+    with license_server.app.app_context():
+        yield
+
+@pytest.fixture
+def client():
+    return license_server.app.test_client()
+
+@pytest.fixture
+def api(client):
+    """(durum kodu, JSON gövde) döndüren istek yardımcısı"""
+    def call(path, body=None, token=None, headers=None, method='POST'):
+        request_headers = dict(headers or {})
+        if token:
+            request_headers['Authorization'] = f'Bearer {token}'
+        response = client.open(path, method=method, json=body, headers=request_headers)
+        return response.status_code, response.get_json(silent=True)
+    return call
+
+@pytest.fixture
+def admin_token(api):
+    status, body = api('/api/admin/login', {'username': 'admin', 'password': 'admin123'})
+    assert status == 200, body
+    return body['token']
+
+@pytest.fixture
+def create_license(api, admin_token):
+    """Yeni müşteri için lisans oluştur, (anahtar, e-posta) döndür"""
+    def create(**options):
+        email = f'{uuid.uuid4().hex[:12]}@example.com'
+        body = dict({
+            'customer_email': email,
+            'customer_name': 'Test Müşterisi',
+            'expiry_days': 30,
+            'edition': 'professional',
+            'max_activations': 3
+        }, **options)
+        status, response = api('/api/admin/licenses/create', body, admin_token)
+        assert status == 200, response
+        return response['license_key'], email
+    return create
+
+@pytest.fixture
+def activated_license(api, create_license):
+    """Tek cihazda etkinleştirilmiş lisans, (anahtar, donanım kimliği, aktivasyon yanıtı) döndür"""
+    license_key, email = create_license()
+    hardware_id = f'HW-{uuid.uuid4().hex[:8]}'
+    status, response = api('/api/v1/activate', {'license_key': license_key, 'email': email, 'hardware_id': hardware_id})
+    assert status == 200, response
+    return license_key, hardware_id, response
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import license_server
+from license_server import AsgiApp, app, db, json_object_error
+
+@pytest.fixture
+def asgi():
+    """Ayrı asenkron motorlu ASGI uygulaması; arka plan işçileri test oturumu boyunca çalışır"""
+    asgi_app = AsgiApp(app)
+    yield asgi_app
+    if asgi_app._engine is not None:
+        asyncio.run(asgi_app._engine.dispose())
+
+async def asgi_call(asgi_app, path, body):
+    raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+    messages = [{'type': 'http.request', 'body': raw, 'more_body': False}]
+    response = {}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] = message['body']
+
+    scope = {
+        'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')], 'client': ('10.1.1.1', 1234)
+    }
+    await asgi_app(scope, receive, send)
+    return response['status'], json.loads(response['body'])
+
+@pytest.mark.parametrize('data', [None, [], 'text', 1])
+def test_non_object_body_is_rejected(data):
+    assert json_object_error(data)['status'] == 'error'
+    assert json_object_error({}) is None
+
+@pytest.mark.parametrize('path', ['/api/v1/validate', '/api/v1/activate', '/api/v1/trial/check'])
+def test_null_body_returns_json_error(client, asgi, path):
+    response = client.post(path, data='null', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['status'] == 'error'
+
+    status, body = asyncio.run(asgi_call(asgi, path, b'null'))
+    assert status == 400
+    assert body['status'] == 'error'
+
+def test_signing_does_not_block_event_loop(monkeypatch, asgi, create_license):
+    license_key, email = create_license()
+    real_sign = license_server.sign_with_key
+    signing_threads = []
+
+    def slow_sign(*args):
+        signing_threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return real_sign(*args)
+
+    monkeypatch.setattr(license_server, 'sign_with_key', slow_sign)
+
+    # Eşzamanlı motor üzerinden olay döngüsünün iş parçacığında çalışan sorgular
+    blocking_queries = []
+    def record_query(*args):
+        if threading.current_thread() is threading.main_thread():
+            blocking_queries.append(args[2])
+
+    with app.app_context():
+        engine = db.engine
+    db.event.listen(engine, 'before_cursor_execute', record_query)
+
+    async def scenario():
+        await asgi.startup()
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        try:
+            activation = await asgi_call(asgi, '/api/v1/activate', {
+                'license_key': license_key, 'email': email, 'hardware_id': 'HW-ASGI'
+            })
+        finally:
+            done.set()
+            await ticking
+        return activation, ticks
+
+    try:
+        (status, body), ticks = asyncio.run(scenario())
+    finally:
+        db.event.remove(engine, 'before_cursor_execute', record_query)
+
+    assert status == 200, body
+    assert body['status'] == 'success'
+    assert signing_threads and threading.main_thread().ident not in signing_threads
+    # İmzalama sürerken döngü diğer görevleri çalıştırmaya devam eder
+    assert ticks >= 10 * len(signing_threads)
+    assert blocking_queries == []
@@ -0,0 +1,64 @@
+import pytest
+
+from license_server import batch_item_error
+
+@pytest.mark.parametrize('item', [
+    'K-1',
+    None,
+    ['K-1', 'HW1'],
+    {'hardware_id': 'HW1'},
+    {'license_key': 'K-1'},
+    {'license_key': ['K-1'], 'hardware_id': 'HW1'},
+    {'license_key': 'K-1', 'hardware_id': {'id': 1}},
+    {'license_key': None, 'hardware_id': 'HW1'}
+])
+def test_invalid_items_are_rejected(item):
+    error = batch_item_error(item)
+
+    assert error['status'] == 'error'
+    assert error['code'] == 'INVALID_REQUEST'
+
+def test_invalid_values_are_not_echoed():
+    error = batch_item_error({'license_key': {'nested': 'x'}, 'hardware_id': 'HW1'})
+
+    assert error['license_key'] is None
+    assert error['hardware_id'] == 'HW1'
+
+def test_valid_item_has_no_error():
+    assert batch_item_error({'license_key': 'K-1', 'hardware_id': 'HW1'}) is None
+
+def test_batch_mixes_valid_and_invalid_items(api, activated_license):
+    license_key, hardware_id, _ = activated_license
+    items = [
+        {'license_key': license_key, 'hardware_id': hardware_id},
+        {'license_key': license_key, 'hardware_id': 'HW-UNKNOWN'},
+        {'license_key': 'ZS-MISSING', 'hardware_id': hardware_id},
+        {'license_key': 42, 'hardware_id': hardware_id},
+        'not-an-object'
+    ]
+
+    status, response = api('/api/v1/validate/batch', {'items': items})
+
+    assert status == 200, response
+    assert response['total'] == len(items)
+    assert response['valid'] == 1
+    results = response['results']
+    assert results[0]['status'] == 'valid'
+    assert results[1]['code'] == 'HARDWARE_NOT_ACTIVATED'
+    assert results[2]['status'] == 'invalid'
+    assert results[3]['code'] == 'INVALID_REQUEST'
+    assert results[4]['code'] == 'INVALID_REQUEST'
+
+def test_batch_without_items_is_rejected(api):
+    status, response = api('/api/v1/validate/batch', {'licenses': []})
+
+    assert status == 400
+    assert response['status'] == 'error'
+
+def test_batch_over_limit_is_rejected(api, server):
+    max_items = int(server.config['api']['batch_validate_max_items'])
+    items = [{'license_key': 'K', 'hardware_id': str(i)} for i in range(max_items + 1)]
+
+    status, response = api('/api/v1/validate/batch', {'items': items})
+
+    assert status == 400
@@ -0,0 +1,38 @@
+import uuid
+
+from license_server import dashboard_stats, shared_state
+
+def dashboard(api, admin_token, fresh=False):
+    status, response = api(f"/api/admin/dashboard/stats{'?fresh=1' if fresh else ''}", token=admin_token, method='GET')
+    assert status == 200, response
+    return response['stats']
+
+def test_trial_conversion_is_counted_incrementally(api, admin_token, create_license):
+    hardware_id = f'HW-{uuid.uuid4().hex[:8]}'
+    before = dashboard(api, admin_token, fresh=True)['trial']
+
+    status, response = api('/api/v1/trial/start', {'hardware_id': hardware_id})
+    assert response['code'] == 'TRIAL_STARTED', response
+
+    # İkinci lisans aynı donanımı tekrar dönüştürmez
+    for _ in range(2):
+        license_key, email = create_license()
+        status, response = api('/api/v1/activate', {'license_key': license_key, 'email': email, 'hardware_id': hardware_id})
+        assert status == 200, response
+
+    trial = dashboard(api, admin_token)['trial']
+    assert trial['converted_trials'] == before['converted_trials'] + 1
+    assert trial == dashboard(api, admin_token, fresh=True)['trial']
+
+def test_only_non_incremental_events_bump_generation(app_context):
+    dashboard_stats.get()
+    generation = shared_state.get('dashboard')
+
+    dashboard_stats.record_event('activation_created')
+    dashboard_stats.record_event('trial_converted')
+    assert shared_state.get('dashboard') == generation
+    assert dashboard_stats.get_stats()['age_seconds'] is not None
+
+    dashboard_stats.record_event('license_extended')
+    assert shared_state.get('dashboard') == generation + 1
+    assert dashboard_stats.get_stats()['age_seconds'] is None
@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import SERVER_DIR, run_server
+from license_server import Activation, build_engine_options, config, db, get_read_session
+
+def test_server_database_gets_pool_settings():
+    options = build_engine_options('postgresql://zstok@db.internal/zstok')
+
+    assert options['max_overflow'] == int(config['database']['max_overflow'])
+    assert options['pool_timeout'] == int(config['database']['pool_timeout'])
+    assert options['pool_recycle'] == int(config['database']['pool_recycle'])
+    assert options['pool_size'] > 0
+    assert 'connect_args' not in options
+
+def test_sqlite_file_uses_shared_queue_pool():
+    options = build_engine_options('sqlite:////var/lib/zstok/licenses.db')
+
+    assert options['max_overflow'] == 0
+    assert options['connect_args']['check_same_thread'] is False
+    assert build_engine_options('sqlite://') == {}
+
+def test_reads_use_primary_without_replica(app_context):
+    assert get_read_session() is db.session
+
+@pytest.fixture
+def trials(app_context):
+    """1 ve 10 gün önce başlamış iki deneme süreci; ikincisi henüz taranmadı (is_active)"""
+    now = datetime.utcnow()
+    hardware_ids = []
+    for days in (1, 10):
+        hardware_id = f'TRIAL-{uuid.uuid4().hex[:8]}'
+        db.session.add(Activation(
+            hardware_id=hardware_id,
+            is_trial=True,
+            trial_hardware_hash=uuid.uuid4().hex,
+            trial_start_date=now - timedelta(days=days),
+            activation_date=now - timedelta(days=days),
+            last_check_date=now,
+            is_active=True
+        ))
+        hardware_ids.append(hardware_id)
+    db.session.commit()
+    return hardware_ids
+
+def trial_report(api, admin_token, report_type):
+    status, response = api(f'/api/admin/reports/trials?type={report_type}', token=admin_token, method='GET')
+    assert status == 200, response
+    assert response['status'] == 'success'
+    return {row['hardware_id']: row for row in response['data']}
+
+def test_trial_report_uses_start_date_for_expiry(api, admin_token, trials):
+    recent, old = trials
+
+    active = trial_report(api, admin_token, 'active')
+    expired = trial_report(api, admin_token, 'expired')
+
+    assert recent in active and old not in active
+    assert old in expired and recent not in expired
+    assert expired[old]['is_expired'] is True
+    assert active[recent]['is_expired'] is False
+
+def postgres_uri():
+    """Test PostgreSQL sunucusunun adresi; yoksa test atlanmaz, başarısız olur"""
+    database_uri = os.environ.get('ZSTOK_TEST_POSTGRES_URI')
+    if not database_uri:
+        pytest.fail(
+            'ZSTOK_TEST_POSTGRES_URI tanımlı değil. Yerel bir PostgreSQL başlatıp boş bir veritabanı '
+            'gösterin, ör. postgresql+psycopg2://zstok@127.0.0.1:5432/zstok_test'
+        )
+    return database_uri
+
+# Ayrı süreçte PostgreSQL'e bağlanıp istemci, admin ve rapor yollarını çalıştırır;
+# replika adresi aynı veritabanını gösterir, okuma oturumu yine ayrı motordan gelir
+POSTGRES_SCENARIO = """
+import json, uuid
+from datetime import datetime, timedelta
+import license_server as ls
+
+ls.rate_limiter.enabled = False
+ls.init_db()
+ls.check_schema_version()
+with ls.app.app_context():
+    assert ls.db.engine.dialect.name == 'postgresql'
+    assert ls.get_read_session() is ls.replica_session
+
+client = ls.app.test_client()
+def call(path, body=None, token=None, method='POST'):
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    response = client.open(path, method=method, json=body, headers=headers)
+    assert response.status_code == 200, (path, response.get_data(as_text=True))
+    return response.get_json()
+
+token = call('/api/admin/login', {'username': 'admin', 'password': 'admin123'})['token']
+email = f'{uuid.uuid4().hex[:12]}@example.com'
+license_key = call('/api/admin/licenses/create', {
+    'customer_email': email, 'customer_name': 'PG', 'expiry_days': 30, 'edition': 'professional'
+}, token)['license_key']
+call('/api/v1/activate', {'license_key': license_key, 'email': email, 'hardware_id': 'PG-HW1'})
+assert call('/api/v1/validate', {'license_key': license_key, 'hardware_id': 'PG-HW1'})['status'] == 'valid'
+batch = call('/api/v1/validate/batch', {'items': [{'license_key': license_key, 'hardware_id': 'PG-HW1'}]})
+assert batch['valid'] == 1
+
+trial_hardware_id = f'PG-TRIAL-{uuid.uuid4().hex[:8]}'
+assert call('/api/v1/trial/start', {'hardware_id': trial_hardware_id})['code'] == 'TRIAL_STARTED'
+with ls.app.app_context():
+    old_trial = ls.Activation(
+        hardware_id=f'PG-OLD-{uuid.uuid4().hex[:8]}', is_trial=True, trial_hardware_hash=uuid.uuid4().hex,
+        trial_start_date=datetime.utcnow() - timedelta(days=10), last_check_date=datetime.utcnow(), is_active=True
+    )
+    ls.db.session.add(old_trial)
+    ls.db.session.commit()
+    old_hardware_id = old_trial.hardware_id
+
+expired = {row['hardware_id'] for row in call('/api/admin/reports/trials?type=expired', token=token, method='GET')['data']}
+active = {row['hardware_id'] for row in call('/api/admin/reports/trials?type=active', token=token, method='GET')['data']}
+assert old_hardware_id in expired and trial_hardware_id not in expired
+assert trial_hardware_id in active and old_hardware_id not in active
+
+for path in ('/api/admin/licenses/list', '/api/admin/customers/list', '/api/admin/dashboard/stats',
+             '/api/admin/reports/licenses', '/api/admin/reports/activations'):
+    call(path, token=token, method='GET')
+
+with ls.app.app_context():
+    print(json.dumps(ls.expiry_sweeper.sweep()))
+"""
+
+def test_postgresql_backend():
+    database_uri = postgres_uri()
+    for args in (['--init-only'], ['--migrate']):
+        result = run_server(database_uri, *args)
+        assert result.returncode == 0, result.stderr
+
+    result = subprocess.run(
+        [sys.executable, '-c', POSTGRES_SCENARIO],
+        cwd=SERVER_DIR,
+        env=dict(os.environ, ZSTOK_DATABASE_URI=database_uri, ZSTOK_REPLICA_URI=database_uri),
+        capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+
+    result = run_server(database_uri, '--sweep')
+    assert result.returncode == 0, result.stderr
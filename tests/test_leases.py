@@ -0,0 +1,70 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from license_server import issue_lease, lease_revocations, license_cache, verify_lease
+
+pytestmark = pytest.mark.usefixtures('app_context')
+
+def make_lease(license_key, hardware_id='HW1'):
+    token, _ = issue_lease(license_key, 1, hardware_id, 1, 'professional', [], datetime.utcnow() + timedelta(days=30))
+    return token
+
+def test_lease_verifies_for_its_license_and_device():
+    token = make_lease('K-LEASE')
+
+    payload = verify_lease(token, 'K-LEASE', 'HW1')
+
+    assert payload['lk'] == 'K-LEASE'
+    assert verify_lease(token, 'K-LEASE', 'HW2') is None
+    assert verify_lease(token, 'K-OTHER', 'HW1') is None
+
+def test_tampered_lease_is_rejected():
+    version, body, signature = make_lease('K-TAMPER').split('.')
+    forged = 'A' if signature[0] != 'A' else 'B'
+
+    assert verify_lease(f'{version}.{body}.{forged}{signature[1:]}', 'K-TAMPER', 'HW1') is None
+    assert verify_lease('not-a-lease', 'K-TAMPER', 'HW1') is None
+
+def test_expired_lease_is_rejected(monkeypatch):
+    token = make_lease('K-EXPIRED')
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 2 * 86400)
+    assert verify_lease(token, 'K-EXPIRED', 'HW1') is None
+
+def test_invalidation_rejects_only_that_license():
+    revoked = make_lease('K-REVOKED')
+    untouched = make_lease('K-UNTOUCHED')
+
+    license_cache.invalidate('K-REVOKED')
+
+    assert verify_lease(revoked, 'K-REVOKED', 'HW1') is None
+    assert verify_lease(untouched, 'K-UNTOUCHED', 'HW1') is not None
+
+def test_lease_issued_after_invalidation_is_accepted():
+    license_cache.invalidate('K-REISSUED')
+
+    assert lease_revocations.is_stale('K-REISSUED', int(time.time()) + 1) is False
+
+def test_revoked_license_lease_is_not_served(api, admin_token, activated_license):
+    license_key, hardware_id, _ = activated_license
+    body = {'license_key': license_key, 'hardware_id': hardware_id}
+
+    # Aktivasyonla aynı saniyede verilen belirteçler güvenli tarafta kalıp reddedilir
+    time.sleep(1.1)
+    status, response = api('/api/v1/validate', body)
+    assert response['status'] == 'valid', response
+    lease = response['lease']
+
+    # Belirteçle yanıtlanan istek yeni belirteç içermez
+    status, response = api('/api/v1/validate', dict(body, lease=lease))
+    assert response['status'] == 'valid'
+    assert 'lease' not in response
+
+    status, response = api('/api/admin/licenses/revoke', {'license_key': license_key}, admin_token)
+    assert status == 200, response
+
+    status, response = api('/api/v1/validate', dict(body, lease=lease))
+    assert response['code'] == 'LICENSE_REVOKED'
@@ -0,0 +1,101 @@
+import time
+
+from license_server import LicenseCache, key_fingerprint, shared_state
+
+STATE = {'license_id': 1, 'is_active': True}
+
+def test_set_and_get():
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    cache.set('K-SET', 'HW1', STATE, cache.generation())
+
+    assert cache.get('K-SET', 'HW1') == STATE
+    assert cache.get('K-SET', 'HW2') is None
+    assert cache.get_stats()['hits'] == 1
+
+def test_entry_expires_after_ttl(monkeypatch):
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    cache.set('K-TTL', 'HW1', STATE, cache.generation())
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    assert cache.get('K-TTL', 'HW1') is None
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LicenseCache(ttl_seconds=60, max_entries=2)
+    for hardware_id in ('HW1', 'HW2'):
+        cache.set('K-LRU', hardware_id, STATE, cache.generation())
+    cache.get('K-LRU', 'HW1')
+    cache.set('K-LRU', 'HW3', STATE, cache.generation())
+
+    assert cache.get('K-LRU', 'HW2') is None
+    assert cache.get('K-LRU', 'HW1') == STATE
+    assert cache.get_stats()['evictions'] == 1
+
+def test_invalidate_drops_every_hardware_id():
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    for hardware_id in ('HW1', 'HW2'):
+        cache.set('K-INV', hardware_id, STATE, cache.generation())
+    cache.set('K-OTHER', 'HW1', STATE, cache.generation())
+
+    cache.invalidate('K-INV')
+
+    assert cache.get('K-INV', 'HW1') is None
+    assert cache.get('K-INV', 'HW2') is None
+    assert cache.get('K-OTHER', 'HW1') == STATE
+
+def test_invalidation_from_another_worker_is_applied():
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    cache.set('K-REMOTE', 'HW1', STATE, cache.generation())
+
+    # Diğer işçi yalnızca paylaşımlı halkaya yazar
+    shared_state.publish(key_fingerprint('K-REMOTE'))
+
+    assert cache.get('K-REMOTE', 'HW1') is None
+    assert cache.get_stats()['remote_invalidations'] == 1
+
+def test_read_racing_an_invalidation_is_not_cached():
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    generation = cache.generation()
+
+    # Veritabanı okuması sürerken lisans iptal edildi
+    cache.invalidate('K-RACE')
+    cache.set('K-RACE', 'HW1', STATE, generation)
+
+    assert cache.get('K-RACE', 'HW1') is None
+    assert cache.get_stats()['stale_skips'] == 1
+
+def test_unrelated_invalidation_does_not_skip_set():
+    cache = LicenseCache(ttl_seconds=60, max_entries=10)
+    generation = cache.generation()
+
+    cache.invalidate('K-UNRELATED')
+    cache.set('K-KEEP', 'HW1', STATE, generation)
+
+    assert cache.get('K-KEEP', 'HW1') == STATE
+
+def test_revocation_is_visible_to_cached_validation(api, admin_token, activated_license):
+    license_key, hardware_id, _ = activated_license
+    body = {'license_key': license_key, 'hardware_id': hardware_id}
+
+    for _ in range(2):
+        status, response = api('/api/v1/validate', body)
+        assert response['status'] == 'valid', response
+
+    status, response = api('/api/admin/licenses/revoke', {'license_key': license_key}, admin_token)
+    assert status == 200, response
+
+    status, response = api('/api/v1/validate', body)
+    assert response['code'] == 'LICENSE_REVOKED'
+
+def test_deactivation_is_visible_to_cached_validation(api, activated_license):
+    license_key, hardware_id, _ = activated_license
+    body = {'license_key': license_key, 'hardware_id': hardware_id}
+
+    status, response = api('/api/v1/validate', body)
+    assert response['status'] == 'valid', response
+
+    status, response = api('/api/v1/deactivate', body)
+    assert status == 200, response
+
+    status, response = api('/api/v1/validate', body)
+    assert response['code'] == 'HARDWARE_NOT_ACTIVATED'
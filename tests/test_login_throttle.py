@@ -0,0 +1,67 @@
+import time
+import uuid
+
+import pytest
+
+from license_server import LoginThrottle, add_failed_login_attempt, app, failed_login_recorder
+
+def test_login_throttle_blocks_after_max_attempts():
+    throttle = LoginThrottle(max_attempts=3, window_seconds=60, slots=64)
+
+    for _ in range(3):
+        assert not throttle.is_blocked('user', '10.0.0.1')
+        throttle.record_failure('user', '10.0.0.1')
+
+    assert throttle.is_blocked('user', '10.0.0.1')
+    assert not throttle.is_blocked('user', '10.0.0.2')
+    assert not throttle.is_blocked('other', '10.0.0.1')
+
+def test_login_throttle_window_slides(monkeypatch):
+    throttle = LoginThrottle(max_attempts=3, window_seconds=60, slots=64)
+    # Pencere başı: önceki penceredeki denemeler tam ağırlıkla sayılır
+    now = 6000.0
+    monkeypatch.setattr(time, 'time', lambda: now)
+    for _ in range(3):
+        throttle.record_failure('user', '10.0.0.1')
+
+    monkeypatch.setattr(time, 'time', lambda: now + 90)
+    assert throttle.attempts('user', '10.0.0.1') == pytest.approx(1.5)
+    assert not throttle.is_blocked('user', '10.0.0.1')
+
+    monkeypatch.setattr(time, 'time', lambda: now + 120)
+    assert throttle.attempts('user', '10.0.0.1') == 0
+
+def test_admin_login_is_throttled_per_client_ip(api, server):
+    username = f'nobody-{uuid.uuid4().hex[:8]}'
+    credentials = {'username': username, 'password': 'wrong'}
+    max_attempts = server.login_throttle.max_attempts
+
+    for _ in range(max_attempts):
+        status, _ = api('/api/admin/login', credentials, headers={'X-Real-IP': '192.0.2.10'})
+        assert status == 401
+
+    status, _ = api('/api/admin/login', credentials, headers={'X-Real-IP': '192.0.2.10'})
+    assert status == 429
+
+    # nginx arkasında diğer istemciler aynı kullanıcı adıyla kilitlenmez
+    status, _ = api('/api/admin/login', credentials, headers={'X-Real-IP': '192.0.2.11'})
+    assert status == 401
+
+def test_failed_write_keeps_attempts_and_login_succeeds(api, monkeypatch):
+    def fail(attempts):
+        raise RuntimeError('veritabanı kullanılamıyor')
+
+    username = f'nobody-{uuid.uuid4().hex[:8]}'
+    monkeypatch.setattr(failed_login_recorder, 'enabled', True)
+    monkeypatch.setattr(failed_login_recorder, '_write', fail)
+    add_failed_login_attempt(username, '192.0.2.20')
+
+    status, response = api('/api/admin/login', {'username': 'admin', 'password': 'admin123'})
+
+    assert status == 200, response
+    assert any(attempt['username'] == username for attempt in failed_login_recorder._pending)
+
+    monkeypatch.undo()
+    with app.app_context():
+        failed_login_recorder.flush_now()
+    assert not any(attempt['username'] == username for attempt in failed_login_recorder._pending)
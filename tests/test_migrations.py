@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+import conftest
+
+def run_server(database_path, *args):
+    return conftest.run_server(f'sqlite:///{database_path}', *args)
+
+def schema_version(connection):
+    return int(connection.execute("SELECT value FROM server_state WHERE key = 'schema_version'").fetchone()[0])
+
+def index_names(connection):
+    return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+@pytest.fixture
+def database(tmp_path):
+    """Güncel şemayla oluşturulmuş boş veritabanı, (yol, bağlantı) döndür"""
+    database_path = tmp_path / 'licenses.db'
+    result = run_server(database_path, '--init-only')
+    assert result.returncode == 0, result.stderr
+
+    connection = sqlite3.connect(database_path)
+    yield database_path, connection
+    connection.close()
+
+def test_new_database_starts_at_current_version(database, server):
+    _, connection = database
+
+    assert schema_version(connection) == server.SCHEMA_VERSION
+
+def test_old_schema_is_migrated(database):
+    database_path, connection = database
+    connection.execute('DROP INDEX ix_license_expired')
+    connection.execute('DROP INDEX ix_activation_trial_active')
+    connection.execute('ALTER TABLE license DROP COLUMN is_expired')
+    connection.execute("UPDATE server_state SET value = '3' WHERE key = 'schema_version'")
+    connection.commit()
+
+    # Eski şemayla sunucu başlatılmaz
+    result = run_server(database_path, '--init-only')
+    assert result.returncode == 1
+
+    result = run_server(database_path, '--migrate')
+    assert result.returncode == 0, result.stderr
+
+    columns = [row[1] for row in connection.execute('PRAGMA table_info(license)')]
+    assert 'is_expired' in columns
+    assert {'ix_license_expired', 'ix_activation_trial_active'} <= index_names(connection)
+    assert schema_version(connection) == 4
+
+    assert run_server(database_path, '--init-only').returncode == 0
+
+def test_duplicate_trials_block_migration_until_removed(database):
+    database_path, connection = database
+    connection.execute('DROP INDEX ux_activation_trial_hash')
+    for _ in range(2):
+        connection.execute(
+            "INSERT INTO activation (hardware_id, is_trial, trial_hardware_hash, is_active) VALUES ('HW1', 1, 'dup-hash', 1)"
+        )
+    connection.execute("UPDATE server_state SET value = '2' WHERE key = 'schema_version'")
+    connection.commit()
+
+    result = run_server(database_path, '--migrate')
+    assert result.returncode == 1
+    assert 'dup-hash' in result.stderr
+
+    # Başarısız göç kaydedilmez; indeks oluşturulmaz
+    assert schema_version(connection) == 2
+    assert 'ux_activation_trial_hash' not in index_names(connection)
+
+    connection.execute("DELETE FROM activation WHERE id = (SELECT MAX(id) FROM activation WHERE trial_hardware_hash = 'dup-hash')")
+    connection.commit()
+
+    result = run_server(database_path, '--migrate')
+    assert result.returncode == 0, result.stderr
+    assert schema_version(connection) == 4
+    assert 'ux_activation_trial_hash' in index_names(connection)
+
+def test_migrate_is_a_no_op_on_current_schema(database):
+    database_path, connection = database
+
+    result = run_server(database_path, '--migrate')
+
+    assert result.returncode == 0, result.stderr
+    assert '0 şema göçü uygulandı' in result.stderr
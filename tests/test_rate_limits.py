@@ -0,0 +1,75 @@
+import time
+import uuid
+
+import pytest
+
+from license_server import RateLimiter, check_rate_limits, parse_rate_limit_buckets, resolve_client_ip
+
+def test_parse_rate_limit_buckets():
+    buckets = parse_rate_limit_buckets({
+        'enabled': 'True',
+        'slots': '1024',
+        'trusted_proxies': '127.0.0.1',
+        'validate_per_ip': '120/60',
+        'activate_per_key': '10',
+        'trial_per_ip': '',
+        'trial_start_per_ip': '0/60'
+    })
+
+    assert buckets == {'validate_per_ip': (120, 2.0), 'activate_per_key': (10, 10.0)}
+
+def test_bucket_sheds_when_empty_and_refills(monkeypatch):
+    limiter = RateLimiter(enabled=True, buckets={'api': (2, 1.0)}, slots=64)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    assert limiter.acquire('api', 'client') == 0
+    assert limiter.acquire('api', 'client') == 0
+    assert limiter.acquire('api', 'client') == pytest.approx(1.0)
+    assert limiter.acquire('api', 'other-client') == 0
+
+    monkeypatch.setattr(time, 'time', lambda: now + 1)
+    assert limiter.acquire('api', 'client') == 0
+    assert limiter.get_stats()['shed'] == {'api': 1}
+
+def test_disabled_limiter_and_unknown_bucket_allow():
+    limiter = RateLimiter(enabled=False, buckets={'api': (1, 1.0)}, slots=64)
+    assert all(limiter.acquire('api', 'client') == 0 for _ in range(5))
+
+    limiter.enabled = True
+    assert all(limiter.acquire('unknown', 'client') == 0 for _ in range(5))
+
+def test_full_table_reuses_least_recent_slot():
+    limiter = RateLimiter(enabled=True, buckets={'api': (1, 0.001)}, slots=4)
+    for i in range(20):
+        assert limiter.acquire('api', f'client-{i}') == 0
+
+def test_batch_spends_one_token_per_item(monkeypatch, server):
+    limiter = RateLimiter(enabled=True, buckets={'validate_per_ip': (10, 0.001)}, slots=64)
+    monkeypatch.setattr(server, 'rate_limiter', limiter)
+    items = [{'license_key': 'K', 'hardware_id': str(i)} for i in range(8)]
+
+    assert check_rate_limits('/api/v1/validate/batch', {'items': items}, '10.1.0.1') is None
+
+    body, retry_after = check_rate_limits('/api/v1/validate/batch', {'items': items}, '10.1.0.1')
+    assert body['code'] == 'RATE_LIMITED'
+    assert retry_after >= 1
+
+def test_endpoint_answers_429_with_retry_after(client, monkeypatch, server):
+    monkeypatch.setattr(server.rate_limiter, 'enabled', True)
+    body = {'license_key': f'ZS-{uuid.uuid4().hex}', 'hardware_id': 'HW1'}
+    capacity = server.rate_limiter.buckets['validate_per_key'][0]
+
+    for i in range(capacity):
+        response = client.post('/api/v1/validate', json=body, headers={'X-Real-IP': f'10.2.{i // 250}.{i % 250}'})
+        assert response.status_code == 200
+
+    response = client.post('/api/v1/validate', json=body, headers={'X-Real-IP': '10.3.0.1'})
+    assert response.status_code == 429
+    assert response.get_json()['code'] == 'RATE_LIMITED'
+    assert int(response.headers['Retry-After']) >= 1
+
+def test_real_ip_is_used_only_from_trusted_proxy():
+    assert resolve_client_ip('127.0.0.1', '203.0.113.7') == '203.0.113.7'
+    assert resolve_client_ip('198.51.100.2', '203.0.113.7') == '198.51.100.2'
+    assert resolve_client_ip('127.0.0.1', None) == '127.0.0.1'
@@ -0,0 +1,38 @@
+from license_server import RevocationEntry, db, hash_license_key, revocation_epoch
+
+def test_epoch_advances_only_after_commit(app_context):
+    before = revocation_epoch.current()
+
+    entry_id = revocation_epoch.bump('K-EPOCH-COMMIT')
+    assert revocation_epoch.current() == before
+
+    db.session.commit()
+    assert revocation_epoch.current() == entry_id
+
+def test_rolled_back_entry_does_not_advance_epoch(app_context):
+    before = revocation_epoch.current()
+
+    entry_id = revocation_epoch.bump('K-EPOCH-ROLLBACK')
+    db.session.rollback()
+
+    assert revocation_epoch.current() == before
+    assert db.session.get(RevocationEntry, entry_id) is None
+
+    # Sonraki commit geri alınan kaydın sıra numarasını yayımlamaz
+    db.session.commit()
+    assert revocation_epoch.current() == before
+
+def test_feed_and_delta_include_revocation(api, client, admin_token, create_license):
+    license_key, _ = create_license()
+    start = client.get('/api/v1/revocations').get_json()['seq']
+
+    status, response = api('/api/admin/licenses/revoke', {'license_key': license_key}, admin_token)
+    assert status == 200, response
+
+    feed = client.get('/api/v1/revocations').get_json()
+    assert feed['seq'] > start
+    assert hash_license_key(license_key) in feed['hashes']
+
+    delta = client.get(f'/api/v1/revocations?since={start}').get_json()
+    assert delta['seq'] == feed['seq']
+    assert {'seq': feed['seq'], 'hash': hash_license_key(license_key), 'action': 'revoke'} in delta['changes']
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from license_server import AsgiApp, app, config, db
+
+PRAGMAS = ('journal_mode', 'busy_timeout', 'synchronous')
+EXPECTED = {
+    'journal_mode': config['database']['sqlite_journal_mode'].lower(),
+    'busy_timeout': int(config['database']['sqlite_busy_timeout_ms']),
+    'synchronous': {'off': 0, 'normal': 1, 'full': 2, 'extra': 3}[config['database']['sqlite_synchronous'].lower()]
+}
+
+def test_pragmas_apply_to_sync_engine(app_context):
+    with db.engine.connect() as connection:
+        pragmas = {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in PRAGMAS}
+
+    assert pragmas == EXPECTED
+
+def test_pragmas_apply_to_async_engine():
+    pytest.importorskip('aiosqlite')
+    asgi = AsgiApp(app)
+
+    async def run():
+        await asgi.startup()
+        try:
+            async with asgi._engine.connect() as connection:
+                return {name: (await connection.exec_driver_sql(f'PRAGMA {name}')).scalar() for name in PRAGMAS}
+        finally:
+            await asgi._engine.dispose()
+
+    assert asyncio.run(run()) == EXPECTED
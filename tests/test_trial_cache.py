@@ -0,0 +1,54 @@
+from license_server import TrialCache, TrialRecord
+
+RECORD = TrialRecord(1, None, True)
+
+def test_trial_start_invalidates_only_that_hardware_hash():
+    # İki işçinin önbelleği aynı paylaşımlı halkayı okur
+    starting_worker = TrialCache(ttl_seconds=60, max_entries=10)
+    other_worker = TrialCache(ttl_seconds=60, max_entries=10)
+    for hardware_hash in ('hash-started', 'hash-untouched'):
+        other_worker.set(hardware_hash, None, other_worker.generation())
+
+    starting_worker.set('hash-started', RECORD, publish=True)
+
+    assert other_worker.get('hash-started') == (False, None)
+    assert other_worker.get('hash-untouched') == (True, None)
+    assert starting_worker.get('hash-started') == (True, RECORD)
+    assert other_worker.get_stats()['remote_invalidations'] == 1
+
+def test_trial_read_racing_a_start_is_not_cached():
+    cache = TrialCache(ttl_seconds=60, max_entries=10)
+    generation = cache.generation()
+
+    # Okuma sürerken başka bir işçi bu donanım için deneme başlattı
+    TrialCache(ttl_seconds=60, max_entries=10).set('hash-race', RECORD, publish=True)
+    cache.set('hash-race', None, generation)
+    cache.set('hash-other', None, generation)
+
+    assert cache.get('hash-race') == (False, None)
+    assert cache.get('hash-other') == (True, None)
+
+def test_trial_read_racing_a_global_invalidation_is_not_cached():
+    cache = TrialCache(ttl_seconds=60, max_entries=10)
+    generation = cache.generation()
+
+    cache.invalidate()
+    cache.set('trial-hash', None, generation)
+
+    assert cache.get('trial-hash') == (False, None)
+    assert cache.get_stats()['stale_skips'] == 1
+
+def test_evicted_entries_leave_no_index():
+    cache = TrialCache(ttl_seconds=60, max_entries=2)
+    for i in range(5):
+        cache.set(f'hash-{i}', None, cache.generation())
+
+    assert len(cache._hashes_by_fingerprint) == 2
+
+def test_trial_flow_uses_cache(api):
+    hardware_id = 'TRIAL-FLOW-1'
+
+    assert api('/api/v1/trial/check', {'hardware_id': hardware_id})[1]['code'] == 'TRIAL_ELIGIBLE'
+    assert api('/api/v1/trial/start', {'hardware_id': hardware_id})[1]['code'] == 'TRIAL_STARTED'
+    assert api('/api/v1/trial/check', {'hardware_id': hardware_id})[1]['code'] == 'TRIAL_ACTIVE'
+    assert api('/api/v1/trial/start', {'hardware_id': hardware_id})[1]['code'] != 'TRIAL_STARTED'